@@ -1,6 +1,6 @@
 import os
 import time
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text
+from sqlalchemy import create_engine, text, Column, Integer, String, DateTime, Text, Index, Computed
 from sqlalchemy.orm import sessionmaker, declarative_base
 from qdrant_client import QdrantClient
 from qdrant_client.http.models import Distance, VectorParams
@@ -23,13 +23,48 @@ class Screenshot(Base):
     app_name = Column(String, nullable=True)
     window_title = Column(String, nullable=True)
     ocr_text = Column(Text, nullable=True) 
+    # Basename of filepath, derived by Postgres so readers don't split paths per row
+    filename = Column(Text, Computed("regexp_replace(filepath, '^.*/', '')", persisted=True))
+
+# Serves "ORDER BY timestamp DESC LIMIT n" and date-range filters without a sort
+Index('ix_screenshots_timestamp', Screenshot.timestamp.desc(), Screenshot.id)
+
+def migrate_schema(engine):
+    # create_all() skips existing tables, so later columns and indexes are added here idempotently
+    with engine.begin() as conn:
+        # Generated columns added after the table was first created
+        conn.execute(text(
+            "ALTER TABLE screenshots ADD COLUMN IF NOT EXISTS filename TEXT "
+            "GENERATED ALWAYS AS (regexp_replace(filepath, '^.*/', '')) STORED"
+        ))
+        # Trigram GIN index lets "ocr_text ILIKE '%q%'" avoid a full table scan
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_screenshots_ocr_trgm "
+            "ON screenshots USING gin (ocr_text gin_trgm_ops)"
+        ))
+        # Full-text index; the frontend's to_tsvector('simple', ocr_text) must match it exactly
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_screenshots_ocr_fts "
+            "ON screenshots USING gin (to_tsvector('simple', ocr_text))"
+        ))
+        # Indexes declared on the model (create_all only adds them to new tables)
+        for index in Screenshot.__table__.indexes:
+            index.create(conn, checkfirst=True)
 
 def init_postgres():
     # Retry loop to wait for DB startup
-    engine = create_engine(POSTGRES_URL)
+    # Pooled connections with a liveness check; psycopg2 batches multi-row INSERTs
+    engine = create_engine(
+        POSTGRES_URL,
+        pool_size=5, max_overflow=5,
+        pool_pre_ping=True, pool_recycle=300,
+        executemany_mode='values_plus_batch'
+    )
     return sessionmaker(bind=engine)
 
 # --- QDRANT SETUP ---
 def init_qdrant():
-    client = QdrantClient(url=QDRANT_URL)
+    # gRPC sends vectors as packed floats instead of JSON number lists
+    client = QdrantClient(url=QDRANT_URL, prefer_grpc=True)
     return client
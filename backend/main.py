@@ -0,0 +1,6 @@
+# Entrypoint. Spawned OCR processes re-run the main script, so it stays empty at
+# import time: they only load ocr_pool.py, never torch/CLIP/database code from worker.py.
+if __name__ == "__main__":
+    from worker import RecallWorker
+    worker = RecallWorker()
+    worker.run()
@@ -0,0 +1,29 @@
+import numpy as np
+
+# --- OCR PROCESS POOL ---
+# Loaded by the OCR processes on their own, so keep this module's imports to NumPy.
+# The main process imports it too (to hand the functions to the pool), so Paddle is only
+# imported inside init_ocr, which runs in the OCR processes.
+# PaddleOCR can't batch on CPU, so we scale it out with one engine per process.
+ocr_engine = None
+
+def init_ocr():
+    global ocr_engine
+    from paddleocr import PaddleOCR
+
+    # Batch of 1 keeps Paddle's inference arenas small; CPU runs batches sequentially anyway
+    ocr_engine = PaddleOCR(
+        use_angle_cls=True, lang='en', show_log=False,
+        rec_batch_num=1, cls_batch_num=1,
+        cpu_threads=2, enable_mkldnn=True,
+        det_limit_side_len=960
+    )
+    # Warm up so MKLDNN picks its kernels before the first real screenshot
+    ocr_engine.ocr(np.zeros((224, 224, 3), dtype=np.uint8), cls=True)
+
+def ocr_image(img_np):
+    # cls=True helps correct if the text is rotated
+    ocr_result = ocr_engine.ocr(img_np, cls=True)
+    if ocr_result and ocr_result[0]:
+        return " ".join([line[1][0] for line in ocr_result[0]])
+    return ""
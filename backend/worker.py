@@ -1,26 +1,44 @@
 import os
+import re
+import errno
+import shutil
 
 # --- MULTICORE OPTIMIZATION ---
-os.environ["OMP_NUM_THREADS"] = "6"
-os.environ["MKL_NUM_THREADS"] = "6"
-os.environ["OPENBLAS_NUM_THREADS"] = "6"
-os.environ["VECLIB_MAXIMUM_THREADS"] = "6"
-os.environ["NUMEXPR_NUM_THREADS"] = "6"
+# OCR runs in several processes, so each one only gets a couple of threads
+os.environ["OMP_NUM_THREADS"] = "2"
+os.environ["MKL_NUM_THREADS"] = "2"
+os.environ["OPENBLAS_NUM_THREADS"] = "2"
+os.environ["VECLIB_MAXIMUM_THREADS"] = "2"
+os.environ["NUMEXPR_NUM_THREADS"] = "2"
 
 import time
+import queue
 import logging
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import yaml
+import numpy as np
 from datetime import datetime
 from PIL import Image
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
 
 # AI Libraries
-from paddleocr import PaddleOCR
+import torch
 from sentence_transformers import SentenceTransformer
+from ocr_pool import init_ocr, ocr_image
 
 # Database
 # Ensure you have a database.py file in the same directory!
-from database import init_postgres, init_qdrant, Screenshot, Base, VECTOR_SIZE
-from qdrant_client.http.models import PointStruct, Distance, VectorParams
+from sqlalchemy.dialects.postgresql import insert
+from database import init_postgres, init_qdrant, migrate_schema, Screenshot, Base, VECTOR_SIZE
+from qdrant_client.http.models import (
+    Distance, VectorParams, HnswConfigDiff, OptimizersConfigDiff,
+    PayloadSchemaType, Filter, IsEmptyCondition, PayloadField,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType, Batch
+)
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
@@ -42,10 +60,49 @@ CONFIG = load_config()
 # Resolve Paths
 INBOX_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, CONFIG.get('storage_path', '../data/inbox')))
 ARCHIVE_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, "../data/archive"))
+THUMB_DIR = os.path.join(ARCHIVE_DIR, "thumbs")
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg')
+TIMESTAMP_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})')
+RESCAN_INTERVAL = 60  # Seconds between safety-net scans of the inbox
+THUMB_SIZE = (320, 200)
+CLIP_IMAGE_SIDE = 448  # CLIP resizes to 224 anyway; frames wait for the encoder at this size
+
+# --- PIPELINE TUNING ---
+QUEUE_SIZE = 4      # Max images buffered between stages (a decoded 4K frame is ~25 MB)
+ENCODE_BATCH = 16   # Max images per CLIP forward pass
+UPSERT_BATCH = 128  # Max rows/points written per Postgres & Qdrant round trip
+MAX_WAIT = 2.0      # Seconds before a partial batch is flushed anyway
+# Bulk mode skips HNSW graph building while a large backlog is ingested
+BULK_MODE = bool(os.getenv("RECALL_BULK_MODE"))
+BULK_THRESHOLD = 50  # Backlog size that enables bulk mode; indexing resumes once fewer files are queued
+# int8 copies of the vectors kept in RAM: 4x less memory traffic per search
+QUANTIZATION = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+OCR_PROCESSES = max(1, (os.cpu_count() or 2) // 2)
+CLIP_THREADS = 6  # CLIP stays in the main process and keeps its own thread budget
+
+# Run CLIP on the GPU when there is one
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 
 # Ensure dirs exist
 os.makedirs(INBOX_DIR, exist_ok=True)
 os.makedirs(ARCHIVE_DIR, exist_ok=True)
+os.makedirs(THUMB_DIR, exist_ok=True)
+
+class InboxHandler(FileSystemEventHandler):
+    def __init__(self, worker):
+        self.worker = worker
+
+    def on_closed(self, event):
+        # Fires once a file written directly into the inbox is complete
+        if not event.is_directory:
+            self.worker.enqueue(os.path.basename(event.src_path), event.src_path)
+
+    def on_moved(self, event):
+        # The watcher renames temp_capture.jpeg to its final name
+        if not event.is_directory:
+            self.worker.enqueue(os.path.basename(event.dest_path), event.dest_path)
 
 class RecallWorker:
     def __init__(self):
@@ -53,23 +110,78 @@ class RecallWorker:
         logger.info(f"Watching: {INBOX_DIR}")
         logger.info(f"Archiving to: {ARCHIVE_DIR}")
         
-        # 1. Wait for Databases (Retry Loop)
-        self.Session = self._connect_postgres()
-        self.qdrant = self._connect_qdrant()
-
-        # 2. AI Models
+        # 1. AI Models, loaded while we wait for the databases
+        # OCR engines load inside the pool's own processes; CLIP loads on a thread here
         logger.info("Loading AI Models...")
-        self.ocr = PaddleOCR(use_angle_cls=True, lang='en', show_log=False) 
-        self.model = SentenceTransformer('clip-ViT-B-32')
+        self.ocr_pool = self._start_ocr_pool()
+        logger.info(f"OCR processes: {OCR_PROCESSES}")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            clip_future = executor.submit(self._load_clip)
+
+            # 2. Wait for Databases (Retry Loop)
+            self.Session = self._connect_postgres()
+            self.qdrant = self._connect_qdrant()
+            self._backfill_timestamps()
+
+            self.model = clip_future.result()
+            self._wait_for_ocr()
+
+        # 3. Pipeline Queues (Inbox -> Reader -> OCR -> Encoder)
+        self.inbox_q = queue.Queue()
+        self.ocr_q = queue.Queue(maxsize=QUEUE_SIZE)
+        self.enc_q = queue.Queue(maxsize=QUEUE_SIZE)
+        # Files currently inside the pipeline, so the reader doesn't queue them twice
+        self.in_flight = set()
+        self.lock = threading.Lock()
+        # Caps frames handed to the OCR pool; each one is a full-size pixel copy until its OCR finishes
+        self.ocr_slots = threading.BoundedSemaphore(OCR_PROCESSES * 2)
+        self.bulk_mode = False
         
         logger.info("Worker Ready.")
 
+    def _start_ocr_pool(self):
+        # If an OCR process dies (OOM killer, Paddle segfault) its pending results fail with
+        # BrokenProcessPool instead of leaving the encoder waiting on them forever
+        pool = ProcessPoolExecutor(
+            max_workers=OCR_PROCESSES,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_ocr
+        )
+        # Processes are only spawned on submit(), so queue one no-op per process to start
+        # every engine now instead of when the first screenshots arrive
+        for _ in range(OCR_PROCESSES):
+            pool.submit(os.getpid)
+        return pool
+
+    def _wait_for_ocr(self):
+        # A process only answers once init_ocr is done, so wait until each one has replied
+        pids = set()
+        while True:
+            pids.update(f.result() for f in [self.ocr_pool.submit(os.getpid) for _ in range(OCR_PROCESSES)])
+            if len(pids) >= OCR_PROCESSES:
+                break
+            time.sleep(0.5)
+        logger.info(f"OCR engines ready: {len(pids)}")
+
+    def _load_clip(self):
+        torch.set_num_threads(CLIP_THREADS)
+        model = SentenceTransformer('clip-ViT-B-32', device=DEVICE)
+        if DEVICE == "cuda":
+            # FP16 halves memory bandwidth with no practical loss for retrieval
+            model.half()
+        logger.info(f"CLIP running on: {DEVICE}")
+
+        # Warm up with a full batch so MKL/cuDNN pick their kernels before real work
+        model.encode([Image.new('RGB', (224, 224))] * ENCODE_BATCH, show_progress_bar=False)
+        return model
+
     def _connect_postgres(self):
         while True:
             try:
                 Session = init_postgres()
                 engine = Session().get_bind()
                 Base.metadata.create_all(engine)
+                migrate_schema(engine)
                 logger.info("Connected to Postgres.")
                 return Session
             except Exception as e:
@@ -80,107 +192,346 @@ class RecallWorker:
         while True:
             try:
                 client = init_qdrant()
-                collections = client.get_collections()
-                names = [c.name for c in collections.collections]
-                if "screenshots" not in names:
+                # One lookup instead of fetching every collection's metadata
+                if not client.collection_exists("screenshots"):
                     client.create_collection(
                         collection_name="screenshots",
-                        vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE),
+                        vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.DOT),
+                        # Fewer, larger segments give the frontend better search latency
+                        optimizers_config=OptimizersConfigDiff(default_segment_number=2),
+                        quantization_config=QUANTIZATION,
                     )
+                elif client.get_collection("screenshots").config.quantization_config is None:
+                    # Collections created before quantization was enabled
+                    client.update_collection("screenshots", quantization_config=QUANTIZATION)
+                # Timestamps live in the payload so the frontend can date-filter in Qdrant
+                client.create_payload_index("screenshots", "ts", field_schema=PayloadSchemaType.INTEGER)
                 logger.info("Connected to Qdrant.")
                 return client
             except Exception as e:
                 logger.warning(f"Waiting for Qdrant... ({e})")
                 time.sleep(2)
 
-    def process_image(self, filename):
-        filepath = os.path.join(INBOX_DIR, filename)
-        
-        # Safety check: Ensure file still exists
-        if not os.path.exists(filepath):
-            return
-
+    def _backfill_timestamps(self):
+        # Points stored before "ts" was part of the payload can't be date-filtered
+        session = self.Session()
         try:
-            # A. OCR
-            # cls=True helps correct if the text is rotated
-            ocr_result = self.ocr.ocr(filepath, cls=True)
-            full_text = ""
-            if ocr_result and ocr_result[0]:
-                full_text = " ".join([line[1][0] for line in ocr_result[0]])
-            
-            # B. Vector Embedding
-            img = Image.open(filepath)
-            vector = self.model.encode(img).tolist()
-
-            # C. Save to Postgres
-            # We try to parse the timestamp from filename, else use current time
+            offset = None
+            while True:
+                points, offset = self.qdrant.scroll(
+                    collection_name="screenshots",
+                    scroll_filter=Filter(must=[IsEmptyCondition(is_empty=PayloadField(key="ts"))]),
+                    limit=256,
+                    offset=offset,
+                    with_payload=False,
+                )
+                ids = [p.id for p in points]
+                if ids:
+                    rows = session.query(Screenshot.id, Screenshot.timestamp).filter(Screenshot.id.in_(ids))
+                    for point_id, timestamp in rows:
+                        self.qdrant.set_payload(
+                            collection_name="screenshots",
+                            payload={"ts": int(timestamp.timestamp())},
+                            points=[point_id],
+                        )
+                    logger.info(f"Backfilled timestamps for {len(ids)} points.")
+                if offset is None:
+                    break
+        except Exception as e:
+            logger.warning(f"Timestamp backfill failed: {e}")
+        finally:
+            session.close()
+
+    def parse_timestamp(self, filename):
+        # We try to parse the timestamp from filename, else use current time
+        # Filename format: 2023-10-27_10-00-00.jpeg
+        match = TIMESTAMP_RE.match(filename)
+        if match:
             try:
-                # Filename format: 2023-10-27_10-00-00.jpeg
-                # Remove extension first
-                clean_name = os.path.splitext(filename)[0]
-                timestamp = datetime.strptime(clean_name, "%Y-%m-%d_%H-%M-%S")
+                return datetime.strptime(match.group(1), "%Y-%m-%d_%H-%M-%S")
             except ValueError:
-                timestamp = datetime.now()
-
-            session = self.Session()
-            new_entry = Screenshot(
-                filepath=os.path.join(ARCHIVE_DIR, filename),
-                timestamp=timestamp,
-                ocr_text=full_text,
-                app_name="Unknown" 
-            )
-            session.add(new_entry)
-            session.commit()
-            
-            # D. Save to Qdrant
-            self.qdrant.upsert(
-                collection_name="screenshots",
-                points=[
-                    PointStruct(
-                        id=new_entry.id, 
-                        vector=vector,
-                        payload={"text": full_text, "path": filename}
-                    )
-                ]
-            )
-            session.close()
+                pass
+        return datetime.now()
 
-            # E. Archive File (Move from Inbox -> Archive)
-            new_path = os.path.join(ARCHIVE_DIR, filename)
-            os.rename(filepath, new_path)
-            logger.info(f"Processed & Archived: {filename}")
+    def release(self, filename):
+        with self.lock:
+            self.in_flight.discard(filename)
 
+    def save_thumbnail(self, filename, img):
+        # Small JPEG for the frontend grid, so it never has to decode full screenshots
+        try:
+            thumb = img.copy()
+            thumb.thumbnail(THUMB_SIZE)
+            thumb.save(os.path.join(THUMB_DIR, os.path.splitext(filename)[0] + ".jpg"), "JPEG", quality=80)
         except Exception as e:
-            logger.error(f"Failed to process {filename}: {e}")
-            # If duplicate in DB, delete the file to prevent infinite loop
-            if "UniqueViolation" in str(e) or "IntegrityError" in str(e):
-                logger.warning(f"Duplicate detected. Deleting {filename}")
-                try:
-                    os.remove(filepath)
-                except:
-                    pass
+            logger.warning(f"Failed to create thumbnail for {filename}: {e}")
 
-    def run(self):
+    # --- DISCOVERY: inotify events + periodic scan ---
+    def enqueue(self, filename, filepath):
+        # Skip the temporary file the watcher is currently writing to
+        if not filename.lower().endswith(IMAGE_EXTS) or filename.startswith("temp_"):
+            return
+        # Skip anything already travelling through the pipeline
+        with self.lock:
+            if filename in self.in_flight:
+                return
+            self.in_flight.add(filename)
+        self.inbox_q.put((filename, filepath))
+
+    def scan_inbox(self):
+        # 1. Look for images (Supported: png, jpg, jpeg)
+        try:
+            with os.scandir(INBOX_DIR) as it:
+                entries = [e for e in it if e.is_file()]
+        except FileNotFoundError:
+            logger.warning(f"Inbox directory {INBOX_DIR} not found. Retrying...")
+            return 0
+
+        # 2. Oldest first (DirEntry caches the stat result)
+        try:
+            entries.sort(key=lambda e: e.stat().st_mtime)
+        except FileNotFoundError:
+            # A file vanished while listing; fall back to name order (names are timestamps)
+            entries.sort(key=lambda e: e.name)
+
+        for entry in entries:
+            self.enqueue(entry.name, entry.path)
+        return len(entries)
+
+    def scan_loop(self):
+        # Catches the startup backlog, missed events and files that failed earlier
         while True:
-            # 1. Look for images (Supported: png, jpg, jpeg)
-            # We added .jpeg here to match the new watcher
+            self.scan_inbox()
+            time.sleep(RESCAN_INTERVAL)
+
+    # --- STAGE A: Read & Decode ---
+    def read_loop(self):
+        while True:
+            filename, filepath = self.inbox_q.get()
             try:
-                files = sorted([f for f in os.listdir(INBOX_DIR) if f.lower().endswith(('.png', '.jpg', '.jpeg'))])
+                with Image.open(filepath) as raw:
+                    img = raw.convert('RGB')
             except FileNotFoundError:
-                logger.warning(f"Inbox directory {INBOX_DIR} not found. Retrying...")
-                time.sleep(5)
+                # Already archived or deleted since it was queued
+                self.release(filename)
                 continue
-            
-            if not files:
-                time.sleep(2)
+            except Exception as e:
+                logger.error(f"Failed to read {filename}: {e}")
+                self.release(filename)
                 continue
 
-            for file in files:
-                # 2. Skip the temporary file the watcher is currently writing to
-                if file.startswith("temp_") or file == "temp_capture.jpeg":
-                    continue
-                
-                self.process_image(file)
+            # Decoded once: PaddleOCR gets the pixels in memory (BGR, like cv2.imread),
+            # CLIP gets the PIL image, so neither re-reads the file
+            img_np = np.ascontiguousarray(np.asarray(img)[:, :, ::-1])
+
+            self.save_thumbnail(filename, img)
+
+            # Only OCR needs full resolution (img_np); shrink what queues up for CLIP
+            scale = CLIP_IMAGE_SIDE / min(img.size)
+            if scale < 1:
+                img = img.resize((round(img.width * scale), round(img.height * scale)), Image.BICUBIC, reducing_gap=2.0)
+
+            # Blocks when the OCR stage falls behind (bounded queue)
+            self.ocr_q.put((filename, filepath, img, img_np))
+
+    # --- STAGE B: OCR ---
+    def ocr_loop(self):
+        while True:
+            filename, filepath, img, img_np = self.ocr_q.get()
+            # OCR runs in the pool; the encoder stage collects the text when it needs it
+            self.ocr_slots.acquire()
+            try:
+                pending = self.ocr_pool.submit(ocr_image, img_np)
+            except BrokenProcessPool:
+                # Files that were in the dead pool fail in the encoder and get picked up by the next scan
+                logger.error("An OCR process died. Restarting the OCR pool...")
+                self.ocr_pool.shutdown(wait=False)
+                self.ocr_pool = self._start_ocr_pool()
+                self._wait_for_ocr()
+                pending = self.ocr_pool.submit(ocr_image, img_np)
+            pending.add_done_callback(lambda _: self.ocr_slots.release())
+            # Only the pool references the BGR copy now, and only until this frame's OCR finishes
+            del img_np
+            self.enc_q.put((filename, filepath, img, pending))
+
+    # --- STAGE C: Embed & Store ---
+    def encode_loop(self):
+        batch = []    # OCR'd files waiting to be embedded
+        pending = []  # Embedded files waiting to be written
+        t0 = time.time()
+        while True:
+            # Flush on whichever comes first: a full batch or MAX_WAIT seconds
+            try:
+                item = self.enc_q.get(timeout=MAX_WAIT)
+                if not batch and not pending:
+                    t0 = time.time()
+                batch.append(item)
+            except queue.Empty:
+                pass
+
+            timed_out = time.time() - t0 > MAX_WAIT
+            if batch and (len(batch) >= ENCODE_BATCH or timed_out):
+                pending.extend(self.embed_batch(batch))
+                batch = []
+            if pending and (len(pending) >= UPSERT_BATCH or timed_out):
+                self.store_batch(pending)
+                pending = []
+
+            # Also checked on idle ticks, so an emptied or paused inbox still ends bulk mode
+            if self.bulk_mode and len(self.in_flight) < BULK_THRESHOLD:
+                self.end_bulk_mode()
+
+    def start_bulk_mode(self, backlog):
+        try:
+            if BULK_MODE and backlog >= BULK_THRESHOLD:
+                # m=0 defers graph construction until the backlog is drained
+                self.qdrant.update_collection("screenshots", hnsw_config=HnswConfigDiff(m=0))
+                self.bulk_mode = True
+                logger.info(f"Bulk mode: HNSW indexing paused for {backlog} queued files.")
+            elif self.qdrant.get_collection("screenshots").config.hnsw_config.m == 0:
+                # A previous run stopped before its backlog was drained
+                self.end_bulk_mode()
+        except Exception as e:
+            logger.warning(f"Could not set up bulk mode: {e}")
+
+    def end_bulk_mode(self):
+        try:
+            self.qdrant.update_collection("screenshots", hnsw_config=HnswConfigDiff(m=16))
+            self.bulk_mode = False
+            logger.info("Backlog drained: HNSW indexing re-enabled.")
+        except Exception as e:
+            logger.warning(f"Could not re-enable HNSW indexing: {e}")
+
+    def embed_batch(self, batch):
+        # A. Collect OCR text from the pool
+        ready = []
+        for filename, filepath, img, pending in batch:
+            try:
+                ready.append((filename, filepath, img, pending.result()))
+            except Exception as e:
+                logger.error(f"Failed to process {filename}: {e}")
+                self.release(filename)
+
+        if not ready:
+            return []
+
+        try:
+            # B. Vector Embedding (one forward pass for the whole batch)
+            imgs = [img for _, _, img, _ in ready]
+            vectors = self.model.encode(
+                imgs, batch_size=len(imgs), convert_to_numpy=True, show_progress_bar=False,
+                # Unit vectors, so the collection can rank by plain dot product
+                normalize_embeddings=True
+            )
+        except Exception as e:
+            for filename, _, _, _ in ready:
+                logger.error(f"Failed to process {filename}: {e}")
+                self.release(filename)
+            return []
+
+        # Drop the decoded images here; only text and vectors wait for the write
+        return [
+            (filename, filepath, full_text, vector)
+            for (filename, filepath, _, full_text), vector in zip(ready, vectors)
+        ]
+
+    def store_batch(self, batch):
+        session = self.Session()
+        try:
+            # C. Save to Postgres (one INSERT ... RETURNING for the whole batch)
+            # Rows that hit the unique filepath are skipped instead of failing the batch
+            timestamps = {filename: self.parse_timestamp(filename) for filename, _, _, _ in batch}
+            stmt = (
+                insert(Screenshot)
+                .values([
+                    {
+                        "filepath": os.path.join(ARCHIVE_DIR, filename),
+                        "timestamp": timestamps[filename],
+                        "ocr_text": full_text,
+                        "app_name": "Unknown",
+                    }
+                    for filename, _, full_text, _ in batch
+                ])
+                .on_conflict_do_nothing(index_elements=["filepath"])
+                .returning(Screenshot.id, Screenshot.filepath)
+            )
+            # Ids come from RETURNING; the transaction stays open until Qdrant has the vectors
+            ids = {filepath: point_id for point_id, filepath in session.execute(stmt)}
+
+            stored = [item for item in batch if os.path.join(ARCHIVE_DIR, item[0]) in ids]
+            duplicates = [item for item in batch if os.path.join(ARCHIVE_DIR, item[0]) not in ids]
+
+            # D. Save to Qdrant (one upsert, no need to wait for indexing)
+            # Sent over the client's existing gRPC channel; upload_collection opens a new one per call
+            if stored:
+                self.qdrant.upsert(
+                    collection_name="screenshots",
+                    points=Batch(
+                        ids=[ids[os.path.join(ARCHIVE_DIR, filename)] for filename, _, _, _ in stored],
+                        vectors=[vector.tolist() for _, _, _, vector in stored],
+                        payloads=[
+                            {
+                                "text": full_text,
+                                "path": filename,
+                                "ts": int(timestamps[filename].timestamp()),
+                            }
+                            for filename, _, full_text, _ in stored
+                        ],
+                    ),
+                    wait=False
+                )
+
+            # Commit only once both stores have the batch. A failed upload rolls the rows back,
+            # so the retry isn't mistaken for a duplicate and deleted.
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            for filename, _, _, _ in batch:
+                logger.error(f"Failed to process {filename}: {e}")
+                self.release(filename)
+            return
+        finally:
+            session.close()
+
+        # If duplicate in DB, delete the file to prevent infinite loop
+        for filename, filepath, _, _ in duplicates:
+            logger.warning(f"Duplicate detected. Deleting {filename}")
+            try:
+                os.remove(filepath)
+            except:
+                pass
+            self.release(filename)
+
+        # E. Archive Files (Move from Inbox -> Archive), once the whole batch is committed
+        for filename, filepath, _, _ in stored:
+            new_path = os.path.join(ARCHIVE_DIR, filename)
+            try:
+                try:
+                    os.replace(filepath, new_path)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    # Inbox and archive are on different mounts: copy + delete instead
+                    shutil.move(filepath, new_path)
+                logger.info(f"Processed & Archived: {filename}")
+            except Exception as e:
+                logger.error(f"Failed to archive {filename}: {e}")
+            self.release(filename)
+
+    def run(self):
+        # New files arrive via inotify instead of polling the inbox
+        observer = Observer()
+        observer.schedule(InboxHandler(self), INBOX_DIR, recursive=False)
+        observer.start()
+
+        # Bulk mode only pays off for a real backlog, so size it up before the stages start
+        self.start_bulk_mode(self.scan_inbox())
+        threading.Thread(target=self.scan_loop, name="scanner", daemon=True).start()
+
+        # Reader -> OCR -> Encoder, each stage on its own thread so they overlap
+        threading.Thread(target=self.read_loop, name="reader", daemon=True).start()
+        threading.Thread(target=self.ocr_loop, name="ocr", daemon=True).start()
+        self.encode_loop()
 
 if __name__ == "__main__":
     worker = RecallWorker()
@@ -0,0 +1,66 @@
+import os
+import numpy as np
+import torch
+from transformers import CLIPModel, CLIPTokenizerFast
+from sentence_transformers import SentenceTransformer
+import onnxruntime as ort
+from onnxruntime.quantization import quantize_dynamic, QuantType
+
+# One-off export of the CLIP text encoder for the frontend's ONNX Runtime path.
+# Run inside the frontend container: docker compose exec frontend python export_clip_onnx.py
+# (clip-ViT-B-32 in sentence-transformers is OpenAI's ViT-B/32 checkpoint)
+BASE_MODEL = "openai/clip-vit-base-patch32"
+MODEL_DIR = os.getenv("CLIP_ONNX_DIR", "/data/models/clip_text")
+FP32_PATH = os.path.join(MODEL_DIR, "clip_text.onnx")
+INT8_PATH = os.path.join(MODEL_DIR, "clip_text_int8.onnx")
+
+class TextEncoder(torch.nn.Module):
+    def __init__(self, clip):
+        super().__init__()
+        self.clip = clip
+
+    def forward(self, input_ids, attention_mask):
+        out = self.clip.get_text_features(input_ids=input_ids, attention_mask=attention_mask)
+        # Newer transformers return a model output instead of the bare tensor
+        return out if isinstance(out, torch.Tensor) else out.pooler_output
+
+if __name__ == "__main__":
+    os.makedirs(MODEL_DIR, exist_ok=True)
+
+    clip = CLIPModel.from_pretrained(BASE_MODEL).eval()
+    tokenizer = CLIPTokenizerFast.from_pretrained(BASE_MODEL)
+    tokenizer.save_pretrained(MODEL_DIR)
+
+    # 1. Export with dynamic batch & sequence axes
+    dummy = tokenizer(["a screenshot of a terminal"], padding=True, return_tensors="pt")
+    torch.onnx.export(
+        TextEncoder(clip),
+        (dummy["input_ids"], dummy["attention_mask"]),
+        FP32_PATH,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["text_embeds"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "text_embeds": {0: "batch"},
+        },
+        opset_version=14,
+    )
+    print(f"Exported: {FP32_PATH}")
+
+    # 2. Dynamic int8 quantization of the weights
+    quantize_dynamic(FP32_PATH, INT8_PATH, weight_type=QuantType.QInt8)
+    print(f"Quantized: {INT8_PATH}")
+
+    # 3. Sanity check against the model the worker indexes with
+    session = ort.InferenceSession(INT8_PATH, providers=["CPUExecutionProvider"])
+    samples = ["cpu usage", "youtube video about cats"]
+    tokens = tokenizer(samples, padding=True, truncation=True, max_length=77, return_tensors="np")
+    (onnx_vecs,) = session.run(None, {
+        "input_ids": tokens["input_ids"].astype(np.int64),
+        "attention_mask": tokens["attention_mask"].astype(np.int64),
+    })
+    ref_vecs = SentenceTransformer('clip-ViT-B-32', device="cpu").encode(samples)
+    for sample, a, b in zip(samples, onnx_vecs, ref_vecs):
+        similarity = float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+        print(f"{sample!r}: cosine vs SentenceTransformer = {similarity:.4f}")
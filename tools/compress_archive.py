@@ -1,8 +1,10 @@
 import os
 from PIL import Image
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 
 ARCHIVE_DIR = "../data/archive"
+THUMB_DIR = os.path.join(ARCHIVE_DIR, "thumbs")
+THUMB_SIZE = (320, 200)
 QUALITY = 80
 
 def compress_image(filename):
@@ -25,13 +27,38 @@ def compress_image(filename):
     except Exception as e:
         print(f"❌ Failed: {filename} ({e})")
 
-files = os.listdir(ARCHIVE_DIR)
-pngs = [f for f in files if f.endswith(".png")]
+def make_thumbnail(filename):
+    # Same thumbnails the worker writes for new screenshots, for older archive files
+    thumb_path = os.path.join(THUMB_DIR, os.path.splitext(filename)[0] + ".jpg")
+    if os.path.exists(thumb_path):
+        return
+
+    try:
+        with Image.open(os.path.join(ARCHIVE_DIR, filename)) as img:
+            # thumbnail() lets libjpeg downscale during decode (draft mode)
+            img.thumbnail(THUMB_SIZE)
+            img.convert('RGB').save(thumb_path, "JPEG", quality=QUALITY)
+    except Exception as e:
+        print(f"❌ Thumbnail failed: {filename} ({e})")
+
+if __name__ == "__main__":
+    files = os.listdir(ARCHIVE_DIR)
+    pngs = [f for f in files if f.endswith(".png")]
+
+    print(f"Found {len(pngs)} PNGs to compress. This will save huge space...")
+
+    # PNG decode + JPEG encode is CPU-bound, so use one process per core (threads share the GIL)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(compress_image, pngs, chunksize=16))
+
+    print("Compression Complete!")
+
+    os.makedirs(THUMB_DIR, exist_ok=True)
+    images = [f for f in os.listdir(ARCHIVE_DIR) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
 
-print(f"Found {len(pngs)} PNGs to compress. This will save huge space...")
+    print(f"Generating thumbnails for {len(images)} screenshots...")
 
-# Run on 4 threads to go fast
-with ThreadPoolExecutor(max_workers=4) as executor:
-    executor.map(compress_image, pngs)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(make_thumbnail, images, chunksize=16))
 
-print("Compression Complete!")
+    print("Thumbnails Complete!")
@@ -1,9 +1,15 @@
+import io
 import time
 import os
+import json
+import socket
 import subprocess
 import logging
+import threading
+from collections import deque
 import yaml
-import imagehash
+import cv2
+import numpy as np
 from PIL import Image
 from datetime import datetime
 
@@ -33,9 +39,37 @@ PAUSE_FILE = os.path.abspath(os.path.join(SCRIPT_DIR, "../data/recall.pause"))
 # Ensure storage exists
 os.makedirs(STORAGE_PATH, exist_ok=True)
 
+# 4. Hyprland IPC sockets (newer releases use $XDG_RUNTIME_DIR/hypr, older ones /tmp/hypr)
+def hypr_socket_path(name):
+    signature = os.getenv("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        return None
+    for base in (os.path.join(os.getenv("XDG_RUNTIME_DIR", ""), "hypr"), "/tmp/hypr"):
+        path = os.path.join(base, signature, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+HYPR_SOCKET = hypr_socket_path(".socket.sock")
+HYPR_EVENT_SOCKET = hypr_socket_path(".socket2.sock")
+
+# Events that usually mean the screen content changed
+CAPTURE_EVENTS = ("activewindow>>", "workspace>>", "focusedmon>>")
+
+def phash(gray):
+    # Perceptual hash as a 64-bit int (same recipe as imagehash.phash, but SIMD resize + DCT):
+    # grayscale uint8 array -> 32x32 -> DCT -> 8x8 lowest frequencies compared to their median
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(small.astype(np.float32))[:8, :8]
+    bits = (low > np.median(low)).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
 class RecallWatcher:
     def __init__(self):
-        self.last_hash = None
+        # Recent frames, so flipping back to an already-captured window is also skipped
+        self.hash_history = deque(maxlen=CONFIG.get('hash_history', 128))
+        self.trigger = threading.Event()
+        self.debounce_timer = None
 
     def is_paused(self):
         if os.path.exists(PAUSE_FILE):
@@ -44,13 +78,22 @@ class RecallWatcher:
 
     def get_active_window_title(self):
         try:
-            output = subprocess.check_output(
-                "hyprctl activewindow -j | grep '\"title\"'", 
-                shell=True
-            ).decode().strip()
-            if ":" in output:
-                return output.split(":", 1)[1].strip().strip('",')
-            return ""
+            if HYPR_SOCKET:
+                # Ask Hyprland directly; it answers one request per connection
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(1)
+                    sock.connect(HYPR_SOCKET)
+                    sock.sendall(b"j/activewindow")
+                    output = b""
+                    while chunk := sock.recv(8192):
+                        output += chunk
+            else:
+                # No shell, no grep: one process and we parse the JSON ourselves
+                output = subprocess.run(
+                    ["hyprctl", "activewindow", "-j"],
+                    capture_output=True, check=True, timeout=2
+                ).stdout
+            return json.loads(output).get("title", "")
         except Exception:
             return "Unknown"
 
@@ -75,28 +118,38 @@ class RecallWatcher:
                 return
 
             # FIX 1: Added timeout=5. If grim hangs, we kill it and move on.
-            subprocess.run(
-                ["grim", "-t", "jpeg", "-q", "80", temp_path], 
+            # grim writes the JPEG to stdout: frames dropped by the dedupe check never touch the disk
+            jpeg_bytes = subprocess.run(
+                ["grim", "-t", "jpeg", "-q", "80", "-"], 
                 check=True, 
+                stdout=subprocess.PIPE,
                 stderr=subprocess.DEVNULL,
                 timeout=5
-            )
-
-            # FIX 2: Use 'with' to ensure file is closed before renaming
-            # This prevents file locking issues
-            with Image.open(temp_path) as img:
-                current_hash = imagehash.phash(img)
-
-            if self.last_hash is not None:
-                diff = current_hash - self.last_hash
-                if diff < CONFIG['similarity_threshold']:
-                    return
+            ).stdout
+
+            with Image.open(io.BytesIO(jpeg_bytes)) as img:
+                # libjpeg decodes straight to ~256px grayscale (DCT-domain downscale),
+                # skipping almost all pixel work; the hash only needs 32x32 anyway
+                img.draft('L', (256, 256))
+                img.load()
+                if img.mode != 'L':
+                    img = img.convert('L')
+                gray = np.asarray(img, dtype=np.uint8)
+            current_hash = phash(gray)
+
+            # Hamming distance: popcount of the differing bits
+            threshold = CONFIG['similarity_threshold']
+            if any((current_hash ^ h).bit_count() < threshold for h in self.hash_history):
+                return
 
             final_filename = f"{timestamp}.jpeg"
             final_path = os.path.join(STORAGE_PATH, final_filename)
+            # Write the captured bytes as-is, then rename so the worker never sees a partial file
+            with open(temp_path, "wb") as f:
+                f.write(jpeg_bytes)
             os.rename(temp_path, final_path)
             
-            self.last_hash = current_hash
+            self.hash_history.append(current_hash)
             logger.info(f"Saved: {final_filename}")
 
         except subprocess.TimeoutExpired:
@@ -106,14 +159,46 @@ class RecallWatcher:
         except Exception as e:
             logger.error(f"Error: {e}")
 
+    def schedule_capture(self):
+        # Debounce: a burst of focus flips collapses into one capture
+        if self.debounce_timer:
+            self.debounce_timer.cancel()
+        self.debounce_timer = threading.Timer(CONFIG.get('event_debounce', 2.0), self.trigger.set)
+        self.debounce_timer.daemon = True
+        self.debounce_timer.start()
+
+    def listen_events(self):
+        while True:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(HYPR_EVENT_SOCKET)
+                    for line in sock.makefile("r", encoding="utf-8", errors="replace"):
+                        if line.startswith(CAPTURE_EVENTS):
+                            self.schedule_capture()
+                logger.warning("Hyprland event stream closed. Reconnecting...")
+            except Exception as e:
+                logger.warning(f"Hyprland event stream lost ({e}). Reconnecting...")
+            time.sleep(5)
+
     def run(self):
         logger.info("Recall Watcher Started.")
         logger.info(f"Saving to: {STORAGE_PATH}")
+
+        # Event mode: capture when Hyprland reports a change, plus a slow idle capture.
+        # Without the event socket we fall back to fixed-interval polling.
+        if CONFIG.get('event_capture', False) and HYPR_EVENT_SOCKET:
+            logger.info("Capturing on Hyprland events.")
+            threading.Thread(target=self.listen_events, daemon=True).start()
+            interval = CONFIG.get('idle_capture_interval', 60.0)
+        else:
+            interval = CONFIG['capture_interval']
         
         try:
             while True:
                 self.capture()
-                time.sleep(CONFIG['capture_interval'])
+                # Sleeps for the interval unless an event triggers a capture sooner
+                self.trigger.wait(timeout=interval)
+                self.trigger.clear()
         except KeyboardInterrupt:
             logger.info("Watcher stopped by user.")
 